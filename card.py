@@ -1,5 +1,6 @@
 class Card:
     def __init__(self, data: dict):
+        self.unique_id = data.get("unique_id")
         self.name = data.get("name")
         self.color = data.get("color", "N/A")
         self.pitch = data.get("pitch")
@@ -25,5 +26,31 @@ class Card:
             "Silver Age": data.get("silver_age_legal", False)
         }
 
+    @classmethod
+    def from_row(cls, row):
+        """Builds a Card from a row of the SQLite cards table, whose columns differ from card.json."""
+        row = dict(row)
+
+        def split(value):
+            return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+        return cls({
+            "unique_id": row.get("unique_id"),
+            "name": row.get("name"),
+            "color": row.get("color"),
+            "pitch": row.get("pitch"),
+            "cost": row.get("cost"),
+            "power": row.get("power"),
+            "defense": row.get("defense"),
+            "types": split(row.get("card_types")),
+            "traits": split(row.get("traits")),
+            "card_keywords": split(row.get("keywords")),
+            "functional_text": row.get("function_text") or "",
+            "printings": [{"image_url": row.get("image_url")}],
+            "cc_legal": bool(row.get("legal_cc")),
+            "blitz_legal": bool(row.get("legal_blitz")),
+            "silver_age_legal": bool(row.get("legal_silver_age"))
+        })
+
     def is_legal(self, format_name):
         return self.legalities.get(format_name, False)
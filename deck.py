@@ -4,27 +4,37 @@ import os
 # Ensure Card can be found even if this is called from subfolders
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
+# Pitch value -> color tag used in deck lists, e.g. "Sink Below (red)"
+PITCH_COLORS = {"1": "red", "2": "yellow", "3": "blue"}
+COLOR_PITCHES = {color: int(pitch) for pitch, color in PITCH_COLORS.items()}
+
 
 class Deck:
     def __init__(self, name="New Deck", format_="CC"):
         self.name = name
         self.format = format_  # "CC" or "Blitz"
-        self.cards = {}  # Structure: { "Card Name": {"obj": Card, "qty": int} }
+        self.cards = {}  # Structure: { "Card Name (red)": {"obj": Card, "qty": int} }
         self.hero = None
 
+    @staticmethod
+    def card_key(card_obj):
+        """Returns the deck key for a card, tagged with its pitch color if it has one."""
+        color = PITCH_COLORS.get(str(card_obj.pitch))
+        return f"{card_obj.name} ({color})" if color else card_obj.name
+
     def set_hero(self, hero_card):
         """Sets the hero for the deck."""
         self.hero = hero_card
 
     def add_card(self, card_obj, quantity=1):
         """Adds a card or increments its quantity."""
-        name = card_obj.name
-
         # Check if the card is a Hero type based on your JSON schema
         if "Hero" in card_obj.type_text or "Hero" in card_obj.types:
             self.set_hero(card_obj)
-            return f"Hero set to {name}"
+            return f"Hero set to {card_obj.name}"
 
+        # Pitch variants of the same card are tracked separately
+        name = self.card_key(card_obj)
         if name in self.cards:
             self.cards[name]["qty"] += quantity
         else:
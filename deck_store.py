@@ -0,0 +1,250 @@
+import json
+import os
+import queue
+import threading
+
+from card import Card
+from deck import Deck
+
+SAVE_VERSION = 1
+SNAPSHOT_FILE = "autosave.json"
+JOURNAL_FILE = "autosave.journal"
+
+
+def card_ref(card_obj):
+    """Stable reference to a card: its card.json id plus name/pitch as a fallback."""
+    return {"id": card_obj.unique_id, "name": card_obj.name, "pitch": card_obj.pitch}
+
+
+def ref_key(ref):
+    """Key used to match a saved card entry between deck states."""
+    return ref.get("id") or f"{ref.get('name')}|{ref.get('pitch')}"
+
+
+def normalize_pitch(pitch):
+    """SQLite stores digit pitches as integers, so "3" and 3 must match the same row."""
+    return int(pitch) if isinstance(pitch, str) and pitch.isdigit() else pitch
+
+
+def deck_to_dict(deck):
+    """Converts a Deck into the structured save format."""
+    return {
+        "version": SAVE_VERSION,
+        "name": deck.name,
+        "format": deck.format,
+        "hero": card_ref(deck.hero) if deck.hero else None,
+        "cards": [dict(card_ref(data["obj"]), qty=data["qty"]) for _, data in sorted(deck.cards.items())]
+    }
+
+
+def deck_from_dict(data, search_engine):
+    """
+    Rebuilds a Deck from the structured save format.
+    All cards are resolved with a single query; returns (deck, missing_names).
+    """
+    deck = Deck(name=data.get("name", "New Deck"), format_=data.get("format", "CC"))
+    hero_ref = data.get("hero")
+    refs = data.get("cards", [])
+
+    lookups = refs + [hero_ref] if hero_ref else refs
+    rows = search_engine.lookup_cards([(r.get("id"), r.get("name"), r.get("pitch")) for r in lookups])
+
+    by_id, by_name = {}, {}
+    for row in rows:
+        card = Card.from_row(row)
+        if card.unique_id:
+            by_id[card.unique_id] = card
+        by_name[(card.name, normalize_pitch(card.pitch))] = card
+
+    def resolve(ref):
+        return by_id.get(ref.get("id")) or by_name.get((ref.get("name"), normalize_pitch(ref.get("pitch"))))
+
+    missing = []
+    if hero_ref:
+        hero = resolve(hero_ref)
+        if hero:
+            deck.set_hero(hero)
+        else:
+            missing.append(hero_ref.get("name"))
+
+    for ref in refs:
+        card = resolve(ref)
+        if card:
+            deck.add_card(card, ref.get("qty", 1))
+        else:
+            missing.append(ref.get("name"))
+
+    return deck, missing
+
+
+def write_json_atomic(path, data):
+    """Writes JSON to a temp file and swaps it in so a crash never leaves a half-written save."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def save_deck_file(deck, path):
+    write_json_atomic(path, deck_to_dict(deck))
+
+
+def load_deck_file(path, search_engine):
+    with open(path, "r", encoding="utf-8") as f:
+        return deck_from_dict(json.load(f), search_engine)
+
+
+def apply_change(state, change):
+    """Applies one journal entry to a deck dict in place."""
+    op = change.get("op")
+    if op == "meta":
+        state["name"] = change["name"]
+        state["format"] = change["format"]
+    elif op == "hero":
+        state["hero"] = change["card"]
+    elif op in ("set", "del"):
+        key = ref_key(change["card"])
+        cards = [c for c in state["cards"] if ref_key(c) != key]
+        if op == "set":
+            cards.append(change["card"])
+        state["cards"] = cards
+
+
+def diff_decks(old, new):
+    """
+    Returns the journal entries that turn deck dict `old` into `new`.
+    Card entries carry absolute quantities so replaying them twice is harmless.
+    """
+    changes = []
+    if old["name"] != new["name"] or old["format"] != new["format"]:
+        changes.append({"op": "meta", "name": new["name"], "format": new["format"]})
+    if old["hero"] != new["hero"]:
+        changes.append({"op": "hero", "card": new["hero"]})
+
+    old_cards = {ref_key(c): c for c in old["cards"]}
+    new_cards = {ref_key(c): c for c in new["cards"]}
+    for key, card in new_cards.items():
+        if old_cards.get(key) != card:
+            changes.append({"op": "set", "card": card})
+    for key, card in old_cards.items():
+        if key not in new_cards:
+            changes.append({"op": "del", "card": card})
+    return changes
+
+
+def load_autosave(directory):
+    """Returns the last autosaved deck dict (snapshot plus journal), or None if there is none."""
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+
+    state = None
+    if os.path.exists(snapshot_path):
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read autosave snapshot: {e}")
+        if state is not None and not isinstance(state, dict):
+            print("Ignoring autosave snapshot: not a deck")
+            state = None
+
+    lines = []
+    if os.path.exists(journal_path):
+        try:
+            with open(journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except (OSError, ValueError) as e:
+            print(f"Could not read autosave journal: {e}")
+
+    if lines:
+        state = state or deck_to_dict(Deck())
+        for line in lines:
+            try:
+                apply_change(state, json.loads(line))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                # A torn last line from a crash mid-write; everything before it is intact
+                break
+
+    return state
+
+
+class DeckAutosaver:
+    """
+    Journals deck changes to data/save_data from a background thread.
+    The Tk thread only queues snapshots; diffing and disk I/O happen on the worker.
+    """
+
+    def __init__(self, directory, baseline=None, compact_after=200):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.compact_after = compact_after
+
+        self._state = baseline or deck_to_dict(Deck())
+        self._journal_len = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="deck-autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, deck):
+        """Queues the current deck for saving. Never blocks."""
+        self._queue.put(deck_to_dict(deck))
+
+    def close(self):
+        """Flushes pending changes and stops the worker."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # Start from a clean journal: appending after a torn line from a crash would glue
+        # new entries onto it, and replay stops at the first line it cannot parse.
+        # The snapshot is rewritten too so it matches the baseline diffs are taken against.
+        if os.path.exists(self.journal_path) or os.path.exists(self.snapshot_path):
+            try:
+                self._compact()
+            except OSError as e:
+                print(f"Autosave failed: {e}")
+
+        while True:
+            latest = self._queue.get()
+            stop = latest is None
+
+            # Coalesce bursts (e.g. a pasted deck) into a single write
+            while not stop:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    latest = item
+
+            if latest is not None:
+                try:
+                    self._write(latest)
+                except OSError as e:
+                    print(f"Autosave failed: {e}")
+            if stop:
+                break
+
+    def _write(self, new_state):
+        changes = diff_decks(self._state, new_state)
+        if not changes:
+            return
+
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for change in changes:
+                f.write(json.dumps(change, separators=(",", ":")) + "\n")
+        self._state = new_state
+        self._journal_len += len(changes)
+
+        if self._journal_len >= self.compact_after:
+            self._compact()
+
+    def _compact(self):
+        # Snapshot first, then truncate: replaying the old journal over the new snapshot is a no-op
+        write_json_atomic(self.snapshot_path, self._state)
+        open(self.journal_path, "w").close()
+        self._journal_len = 0
@@ -5,8 +5,10 @@ import requests
 from io import BytesIO
 from PIL import Image, ImageTk
 from sqlite.search_sqlite import SQLiteSearch
-from deck import Deck
+from deck import Deck, COLOR_PITCHES
 from card import Card
+from deck_store import (DeckAutosaver, load_autosave, deck_from_dict, save_deck_file, load_deck_file,
+                        deck_to_dict, write_json_atomic)
 import ctypes
 import re
 from tkinter import filedialog
@@ -51,16 +53,52 @@ class FabGui:
             'legal_cc': tk.BooleanVar(), 'legal_blitz': tk.BooleanVar(), 'legal_silver_age': tk.BooleanVar()
         }
 
+        # Autosave journals deck edits to data/save_data on a background thread
+        save_dir = os.path.join(os.path.dirname(__file__), "data", "save_data")
+        # The restored deck replaces the autosave on the first refresh, so anything that cannot
+        # be restored is copied aside first; it can be reopened later with Load
+        backup_path = os.path.join(save_dir, "autosave_unresolved.json")
+        autosaved, baseline, restore_warning = None, None, None
+        try:
+            autosaved = load_autosave(save_dir)
+            if autosaved:
+                self.current_deck, missing = deck_from_dict(autosaved, self.search_engine)
+                baseline = deck_to_dict(self.current_deck)
+                if missing:
+                    restore_warning = "Could not find in DB:\n" + "\n".join(set(missing))
+        except Exception as e:
+            # Unexpected snapshot shape: start empty rather than failing to open
+            restore_warning = f"Could not restore the last deck: {e}"
+            self.current_deck = Deck(format_="CC")
+
+        if restore_warning and autosaved:
+            try:
+                write_json_atomic(backup_path, autosaved)
+                restore_warning += f"\n\nThe previous deck was kept in {backup_path}"
+            except Exception as e:
+                print(f"Could not back up autosave: {e}")
+        self.autosave = DeckAutosaver(save_dir, baseline=baseline)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         self.setup_ui()
+        self.refresh_deck_display()
         self.perform_search()
 
+        if restore_warning:
+            messagebox.showwarning("Restore Summary", restore_warning)
+
+    def on_close(self):
+        """Flushes the autosave before the window goes away."""
+        self.autosave.close()
+        self.root.destroy()
+
     def add_to_deck(self):
         selected_ids = self.tree.selection()
         if not selected_ids:
             return
         for item_id in selected_ids:
-            card_name = self.tree.item(item_id)['values'][0]
-            card_obj = self.get_card_object_by_name(card_name)
+            values = self.tree.item(item_id)['values']
+            card_obj = self.get_card_object_by_name(values[0], values[2])
             if card_obj:
                 self.current_deck.add_card(card_obj)
                 self.refresh_deck_display()
@@ -85,9 +123,16 @@ class FabGui:
         else:
             self.count_label.config(foreground="black")
 
-    def get_card_object_by_name(self, name):
-        res = self.search_engine.conn.execute("SELECT * FROM cards WHERE name = ?", (name,)).fetchone()
-        return Card(dict(res)) if res else None
+        self.autosave.submit(self.current_deck)
+
+    def get_card_object_by_name(self, name, pitch=None):
+        res = None
+        if pitch not in (None, ""):
+            res = self.search_engine.conn.execute("SELECT * FROM cards WHERE name = ? AND pitch = ?",
+                                                  (name, pitch)).fetchone()
+        if not res:
+            res = self.search_engine.conn.execute("SELECT * FROM cards WHERE name = ?", (name,)).fetchone()
+        return Card.from_row(res) if res else None
 
     def check_deck(self):
         is_legal, errors = self.current_deck.validate_legality()
@@ -172,6 +217,7 @@ class FabGui:
         ttk.Button(btn_f, text="💾 Save", command=self.save_deck).pack(side="left", expand=True, fill="x", padx=1)
         ttk.Button(btn_f, text="📋 Paste", command=self.open_import_window).pack(side="left", expand=True, fill="x",
                                                                                 padx=1)
+        ttk.Button(btn_f, text="📤 Export", command=self.export_deck).pack(side="left", expand=True, fill="x", padx=1)
         ttk.Button(deck_frame, text="🗑️ Clear Deck", command=self.clear_deck).pack(fill="x", pady=2)
 
         self.count_label = ttk.Label(deck_frame, text="Total Cards: 0 | Format: CC", font=("Arial", 10, "bold"))
@@ -313,19 +359,19 @@ class FabGui:
                 continue
 
             # Regex to find: [Quantity]x [Card Name] ([Color])
-            # Example: "2x Autumn's Touch (red)" -> Groups: "2", "Autumn's Touch"
-            match = re.match(r'^(\d+)x?\s+([^(]+)', line)
+            # Example: "2x Autumn's Touch (red)" -> Groups: "2", "Autumn's Touch", "red"
+            match = re.match(r'^(\d+)x?\s+([^(]+)(?:\((\w+)\))?', line)
 
             if match:
                 qty = int(match.group(1))
                 # .strip() removes trailing spaces before the parentheses
                 name = match.group(2).strip()
+                pitch = COLOR_PITCHES.get(match.group(3))
 
                 # Use your existing helper to find the card object
-                card_obj = self.get_card_object_by_name(name)
+                card_obj = self.get_card_object_by_name(name, pitch)
                 if card_obj:
-                    for _ in range(qty):
-                        self.current_deck.add_card(card_obj)
+                    self.current_deck.add_card(card_obj, qty)
                     added_count += qty
                 else:
                     missing_cards.append(name)
@@ -357,23 +403,25 @@ class FabGui:
     def save_deck(self):
         """
         Saves the deck directly to data/save_data/saved_decks
-        using a sanitized version of the deck name.
+        as a structured .json file keyed by card id and pitch.
         """
-        if not self.current_deck.cards and not self.current_deck.hero:
-            messagebox.showwarning("Save Error", "Your deck is empty!")
+        file_path = self.get_deck_save_path(".json")
+        if not file_path:
             return
 
-        # 1. Setup the Path
-        base_path = os.path.dirname(__file__)
-        save_dir = os.path.join(base_path, "data", "save_data", "saved_decks")
-        os.makedirs(save_dir, exist_ok=True)
+        try:
+            save_deck_file(self.current_deck, file_path)
+            print(f"Deck saved to: {file_path}")
+            messagebox.showinfo("Saved", f"Deck saved as '{os.path.basename(file_path)}'")
+        except Exception as e:
+            messagebox.showerror("Save Error", f"Could not save file: {e}")
 
-        # 2. Sanitize the filename
-        # This turns "Calling: Hong Kong 1st" into "Calling Hong Kong 1st"
-        safe_name = self.sanitize_filename(self.current_deck.name)
-        file_path = os.path.join(save_dir, f"{safe_name}.txt")
+    def export_deck(self):
+        """Exports the deck as a human-readable .txt list that can be pasted back in."""
+        file_path = self.get_deck_save_path(".txt")
+        if not file_path:
+            return
 
-        # 3. Write Data
         try:
             with open(file_path, "w", encoding="utf-8") as f:
                 f.write(f"Name: {self.current_deck.name}\n")
@@ -381,18 +429,31 @@ class FabGui:
                 f.write(f"Format: {self.current_deck.format}\n\n")
 
                 f.write("Deck cards\n")
+                # Deck keys already carry the color tag, e.g. "Sink Below (red)"
                 for name, data in sorted(self.current_deck.cards.items()):
-                    # Detect pitch for color tags
-                    pitch = getattr(data['obj'], 'pitch', None)
-                    tag = {1: " (red)", 2: " (yellow)", 3: " (blue)"}.get(pitch, "")
-                    f.write(f"{data['qty']}x {name}{tag}\n")
+                    f.write(f"{data['qty']}x {name}\n")
 
-            # Visual feedback without a dialog: update the status label or console
-            print(f"Deck saved to: {file_path}")
-            messagebox.showinfo("Saved", f"Deck saved as '{safe_name}.txt'")
+            print(f"Deck exported to: {file_path}")
+            messagebox.showinfo("Exported", f"Deck exported as '{os.path.basename(file_path)}'")
 
         except Exception as e:
-            messagebox.showerror("Save Error", f"Could not save file: {e}")
+            messagebox.showerror("Export Error", f"Could not export file: {e}")
+
+    def get_deck_save_path(self, extension):
+        """Builds data/save_data/saved_decks/<deck name><extension>, or None if the deck is empty."""
+        if not self.current_deck.cards and not self.current_deck.hero:
+            messagebox.showwarning("Save Error", "Your deck is empty!")
+            return None
+
+        # 1. Setup the Path
+        base_path = os.path.dirname(__file__)
+        save_dir = os.path.join(base_path, "data", "save_data", "saved_decks")
+        os.makedirs(save_dir, exist_ok=True)
+
+        # 2. Sanitize the filename
+        # This turns "Calling: Hong Kong 1st" into "Calling Hong Kong 1st"
+        safe_name = self.sanitize_filename(self.current_deck.name)
+        return os.path.join(save_dir, f"{safe_name}{extension}")
 
     def sanitize_filename(self, filename):
         """Removes characters that are illegal in file names."""
@@ -409,12 +470,25 @@ class FabGui:
         file_path = filedialog.askopenfilename(
             initialdir=save_dir,
             title="Load Saved Deck",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Deck files", "*.json *.txt"), ("All files", "*.*")]
         )
 
         if not file_path:
             return
 
+        # Structured saves resolve every card in one query
+        if file_path.endswith(".json"):
+            try:
+                self.current_deck, missing = load_deck_file(file_path, self.search_engine)
+            except Exception as e:
+                messagebox.showerror("Load Error", f"Could not load file: {e}")
+                return
+
+            self.refresh_deck_display()
+            if missing:
+                messagebox.showwarning("Load Summary", "Could not find in DB:\n" + "\n".join(set(missing)))
+            return
+
         try:
             # 3. Read the content
             with open(file_path, "r", encoding="utf-8") as f:
@@ -0,0 +1,135 @@
+"""
+Concurrent load test for server.py. Start the server first, then e.g.
+
+    python load_test.py --concurrency 64 --duration 15
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlencode, quote
+
+SEARCH_TERMS = ["a", "bull", "strike", "fire", "shield", "blade", "arcane", "lightning", "rune", "ninja"]
+
+
+async def request(reader, writer, host, method, path, body=b"", headers=None):
+    """Sends one keep-alive request and returns (status, body)."""
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", f"Content-Length: {len(body)}"]
+    lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    response_headers = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in head[1:] if ":" in l)}
+
+    if response_headers.get("transfer-encoding") == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            chunks.append(chunk[:-2])
+        return status, b"".join(chunks), response_headers
+    length = int(response_headers.get("content-length", 0))
+    return status, await reader.readexactly(length), response_headers
+
+
+async def discover(host, port):
+    """Collects card ids and image names to request, using one search against the server."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body, _ = await request(reader, writer, host, "GET", "/search?legal_cc=1")
+    finally:
+        writer.close()
+    cards = json.loads(body)
+    if not cards:
+        raise SystemExit("Server returned no cards; is the database built?")
+    return cards
+
+
+def make_deck(cards):
+    sample = random.sample(cards, min(20, len(cards)))
+    return {"name": "Load Test", "format": "CC", "hero": None,
+            "cards": [{"id": c.get("unique_id"), "name": c["name"], "pitch": c["pitch"], "qty": 3} for c in sample]}
+
+
+def next_request(cards, etags):
+    """Picks a random request from the search/card/image/validate mix."""
+    card = random.choice(cards)
+    kind = random.choices(["search", "card", "image", "validate"], weights=[4, 3, 2, 1])[0]
+    headers, body, method = {}, b"", "GET"
+
+    if kind == "search":
+        path = "/search?" + urlencode({"name": random.choice(SEARCH_TERMS)})
+    elif kind == "card":
+        path = f"/cards/{quote(str(card.get('unique_id') or card['id']))}"
+    elif kind == "image":
+        # Real file names contain spaces, e.g. "Tectonic Rift_1.png"
+        path = f"/images/{quote(card['local_path'])}"
+        if path in etags:
+            headers["If-None-Match"] = etags[path]
+    else:
+        method, path = "POST", "/decks/validate"
+        body = json.dumps(make_deck(cards)).encode()
+        headers["Content-Type"] = "application/json"
+    return kind, method, path, body, headers
+
+
+async def worker(host, port, cards, deadline, stats):
+    etags = {}
+    while time.perf_counter() < deadline:
+        # The server closes the connection after errors, and connects can be refused under
+        # backlog pressure; count the failure and reconnect rather than dropping this worker
+        writer = None
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            while time.perf_counter() < deadline:
+                kind, method, path, body, headers = next_request(cards, etags)
+                start = time.perf_counter()
+                status, _, response_headers = await request(reader, writer, host, method, path, body, headers)
+                stats["latency"][kind].append(time.perf_counter() - start)
+                stats["status"][status] += 1
+                if "etag" in response_headers:
+                    etags[path] = response_headers["etag"]
+        except (OSError, asyncio.IncompleteReadError) as e:
+            stats["status"][f"connection error: {type(e).__name__}"] += 1
+            await asyncio.sleep(0.01)  # Don't spin if the server is refusing connections
+        finally:
+            if writer:
+                writer.close()
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+async def main(host, port, concurrency, duration):
+    cards = await discover(host, port)
+    stats = {"latency": {k: [] for k in ["search", "card", "image", "validate"]}, "status": Counter()}
+
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(worker(host, port, cards, deadline, stats) for _ in range(concurrency)))
+
+    total = sum(len(v) for v in stats["latency"].values())
+    print(f"{total} requests in {duration}s with {concurrency} connections: {total / duration:.0f} req/s")
+    for kind, values in stats["latency"].items():
+        if values:
+            print(f"  {kind:<9} n={len(values):<7} p50={percentile(values, 0.5):7.1f}ms "
+                  f"p95={percentile(values, 0.95):7.1f}ms p99={percentile(values, 0.99):7.1f}ms")
+    print("  status: " + ", ".join(f"{k}={v}" for k, v in sorted(stats["status"].items(), key=str)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the local card-search service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.host, args.port, args.concurrency, args.duration))
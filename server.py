@@ -0,0 +1,376 @@
+"""
+Local HTTP/JSON card-search service.
+
+    python server.py --port 8080
+
+GET  /search?name=bull&pitch=1&legal_cc=1   Streamed JSON array of matching cards
+GET  /cards/<unique_id or row id>          One card
+GET  /images/<local_path>                  Card art from data/images (ETag / 304)
+POST /decks/validate                       Structured deck JSON (see deck_store.py) -> legality report
+"""
+import argparse
+import asyncio
+import json
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from sqlite.search_sqlite import SQLiteSearch
+from deck_store import deck_from_dict
+
+IMAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "data", "images"))
+
+SEARCH_FILTERS = ['name', 'color', 'pitch', 'cost', 'power', 'defense', 'types', 'traits', 'keywords', 'text']
+LEGAL_FLAGS = ['legal_cc', 'legal_blitz', 'legal_silver_age']
+SEARCH_BATCH = 500
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+KEEP_ALIVE_SECONDS = 15
+MAX_DECK_ENTRIES = 200  # Distinct cards per deck; real decks are well under 100
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error", 504: "Gateway Timeout"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ConnectionPool:
+    """A fixed set of read-only SQLiteSearch connections, each used by one worker thread at a time."""
+
+    def __init__(self, size):
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="fab-db")
+        self._idle = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(SQLiteSearch(read_only=True))
+
+    @asynccontextmanager
+    async def connection(self):
+        lease = _Lease(self, await self._idle.get())
+        try:
+            yield lease
+        finally:
+            lease.release()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        while not self._idle.empty():
+            self._idle.get_nowait().conn.close()
+
+
+class _Lease:
+    def __init__(self, pool, engine):
+        self.pool = pool
+        self.engine = engine
+        self._pending = None
+
+    async def run(self, func, *args):
+        """Runs func on the pool's threads. Cancelling the caller does not hand the connection on mid-query."""
+        self._pending = asyncio.get_running_loop().run_in_executor(self.pool.executor, func, *args)
+        return await asyncio.shield(self._pending)
+
+    def release(self):
+        if self._pending is None or self._pending.done():
+            self.pool._idle.put_nowait(self.engine)
+            return
+        # The request timed out while a query was still running: abort it and reuse the connection afterwards
+        self.engine.conn.interrupt()
+        self._pending.add_done_callback(self._return_after)
+
+    def _return_after(self, future):
+        if not future.cancelled():
+            future.exception()  # Mark the (expected) interrupt error as retrieved
+        self.pool._idle.put_nowait(self.engine)
+
+
+def fetch_json_batch(cursor, size):
+    """Fetches the next batch of JSON rows joined with commas, or None once the cursor is exhausted."""
+    rows = cursor.fetchmany(size)
+    return ",".join(r[0] for r in rows).encode() if rows else None
+
+
+def validate_deck(data, engine):
+    deck, missing = deck_from_dict(data, engine)
+    is_legal, errors = deck.validate_legality()
+    return {
+        "name": deck.name,
+        "format": deck.format,
+        "legal": is_legal and not missing,
+        "errors": errors,
+        "missing": missing,
+        "total_cards": sum(item["qty"] for item in deck.cards.values())
+    }
+
+
+def read_image(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class CardServer:
+    def __init__(self, pool, timeout=10.0):
+        self.pool = pool
+        self.timeout = timeout
+
+    async def handle_client(self, reader, writer):
+        """Serves requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_SECONDS)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                response = _Response(writer)
+                try:
+                    method, target, headers, keep_alive = self.parse_head(head)
+                    await asyncio.wait_for(self.respond(reader, method, target, headers, response), self.timeout)
+                except HttpError as e:
+                    # After a bad head or an oversized body the stream position is unknown
+                    keep_alive = e.status not in (400, 413) and keep_alive
+                    await response.send_error(e.status, e.message)
+                except asyncio.TimeoutError:
+                    keep_alive = False
+                    if response.body_read:
+                        await response.send_error(504, f"Request took longer than {self.timeout}s")
+                    else:
+                        # The client stopped sending its body; that is its timeout, not ours
+                        await response.send_error(408, f"Request body not received within {self.timeout}s")
+                except Exception as e:
+                    keep_alive = False
+                    print(f"Request failed: {e}")
+                    await response.send_error(500, "Internal server error")
+
+                # A response cut off mid-stream leaves the connection in an unknown state
+                if not keep_alive or not response.finished:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, reader, method, target, headers, response):
+        # The body is read inside the timeout so a client that stalls mid-body cannot hold the connection
+        body = await self.read_body(reader, headers)
+        response.body_read = True
+        await self.dispatch(method, target, headers, body, response)
+
+    @staticmethod
+    def parse_head(head):
+        try:
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, headers, keep_alive
+
+    @staticmethod
+    async def read_body(reader, headers):
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HttpError(400, "Invalid Content-Length")
+        if length < 0:
+            raise HttpError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, f"Body larger than {MAX_BODY_BYTES} bytes")
+        return await reader.readexactly(length) if length else b""
+
+    async def dispatch(self, method, target, headers, body, response):
+        url = urlsplit(target)
+        path = unquote(url.path)
+
+        if path == "/search":
+            self.require(method, "GET")
+            await self.search(parse_qs(url.query), response)
+        elif path.startswith("/cards/"):
+            self.require(method, "GET")
+            await self.get_card(path[len("/cards/"):], response)
+        elif path.startswith("/images/"):
+            self.require(method, "GET")
+            await self.get_image(path[len("/images/"):], headers, response)
+        elif path == "/decks/validate":
+            self.require(method, "POST")
+            await self.validate(body, response)
+        else:
+            raise HttpError(404, f"No route for {path}")
+
+    @staticmethod
+    def require(method, allowed):
+        if method != allowed:
+            raise HttpError(405, f"Use {allowed}")
+
+    async def search(self, query, response):
+        filters = {k: query[k][0] for k in SEARCH_FILTERS if query.get(k, [""])[0]}
+        for flag in LEGAL_FLAGS:
+            if query.get(flag, [""])[0].lower() in ("1", "true", "yes"):
+                filters[flag] = True
+
+        async with self.pool.connection() as lease:
+            # SQLite encodes the rows itself, keeping JSON work off the GIL
+            cursor = await lease.run(lease.engine.search_cursor, filters, True)
+            # Rows are streamed in batches so large result sets never sit in memory as one document
+            await response.start(200, {"Content-Type": "application/json"}, chunked=True)
+            await response.write_chunk(b"[")
+            first = True
+            while True:
+                batch = await lease.run(fetch_json_batch, cursor, SEARCH_BATCH)
+                if batch is None:
+                    break
+                await response.write_chunk(batch if first else b"," + batch)
+                first = False
+            await response.write_chunk(b"]")
+            await response.finish()
+
+    async def get_card(self, card_id, response):
+        async with self.pool.connection() as lease:
+            row = await lease.run(lease.engine.get_card, card_id)
+        if not row:
+            raise HttpError(404, f"Card {card_id} not found")
+        await response.send_json(200, dict(row))
+
+    async def get_image(self, filename, headers, response):
+        path = os.path.abspath(os.path.join(IMAGES_DIR, filename))
+        if os.path.commonpath([path, IMAGES_DIR]) != IMAGES_DIR or not os.path.isfile(path):
+            raise HttpError(404, f"Image {filename} not found")
+
+        stat = os.stat(path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+        if etag in headers.get("if-none-match", ""):
+            await response.send(304, cache_headers, b"")
+            return
+
+        data = await asyncio.get_running_loop().run_in_executor(None, read_image, path)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        await response.send(200, dict(cache_headers, **{"Content-Type": content_type}), data)
+
+    async def validate(self, body, response):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HttpError(400, "Body must be a JSON deck")
+        self.check_deck_shape(data)
+
+        async with self.pool.connection() as lease:
+            report = await lease.run(validate_deck, data, lease.engine)
+        await response.send_json(200, report)
+
+    @staticmethod
+    def check_deck_shape(data):
+        """Rejects malformed decks with a 400 before a connection is leased."""
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body must be a JSON deck")
+        for key in ("name", "format"):
+            if key in data and not isinstance(data[key], str):
+                raise HttpError(400, f"'{key}' must be a string")
+
+        def check_ref(ref, where):
+            if not isinstance(ref, dict):
+                raise HttpError(400, f"{where} must be an object")
+            for key in ("id", "name"):
+                if ref.get(key) is not None and not isinstance(ref[key], str):
+                    raise HttpError(400, f"{where}.{key} must be a string")
+            pitch = ref.get("pitch")
+            if pitch is not None and (isinstance(pitch, bool) or not isinstance(pitch, (int, str))):
+                raise HttpError(400, f"{where}.pitch must be a number or string")
+
+        hero = data.get("hero")
+        if hero is not None:
+            check_ref(hero, "hero")
+
+        cards = data.get("cards", [])
+        if not isinstance(cards, list):
+            raise HttpError(400, "'cards' must be a list")
+        if len(cards) > MAX_DECK_ENTRIES:
+            raise HttpError(400, f"Deck has more than {MAX_DECK_ENTRIES} distinct cards")
+        for i, ref in enumerate(cards):
+            check_ref(ref, f"cards[{i}]")
+            qty = ref.get("qty", 1)
+            if isinstance(qty, bool) or not isinstance(qty, int) or qty < 1:
+                raise HttpError(400, f"cards[{i}].qty must be a positive integer")
+
+
+class _Response:
+    def __init__(self, writer):
+        self.writer = writer
+        self.started = False
+        self.finished = False
+        self.body_read = False
+        self._chunked = False
+
+    async def start(self, status, headers, chunked=False, length=0):
+        self.started = True
+        self._chunked = chunked
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        lines.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+    async def write_chunk(self, data):
+        self.writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await self.writer.drain()
+
+    async def finish(self):
+        if self._chunked:
+            self.writer.write(b"0\r\n\r\n")
+            await self.writer.drain()
+        self.finished = True
+
+    async def send(self, status, headers, body):
+        await self.start(status, headers, length=len(body))
+        if body:
+            self.writer.write(body)
+            await self.writer.drain()
+        self.finished = True
+
+    async def send_json(self, status, data):
+        body = json.dumps(data, separators=(",", ":")).encode()
+        await self.send(status, {"Content-Type": "application/json"}, body)
+
+    async def send_error(self, status, message):
+        # Once headers are out the status can no longer change; the caller drops the connection instead
+        if not self.started:
+            await self.send_json(status, {"error": message})
+
+
+async def serve(host, port, pool_size, timeout):
+    pool = ConnectionPool(pool_size)
+    app = CardServer(pool, timeout)
+    server = await asyncio.start_server(app.handle_client, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+    print(f"Serving on http://{host}:{port} ({pool_size} DB connections, {timeout}s timeout)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local card-search HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pool-size", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.pool_size, args.timeout))
+    except KeyboardInterrupt:
+        pass
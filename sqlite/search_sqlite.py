@@ -1,17 +1,33 @@
 import sqlite3
 import os
+from pathlib import Path
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "fab_cards.db")
 
 
 class SQLiteSearch:
-    def __init__(self):
+    def __init__(self, read_only=False):
         if not os.path.exists(DB_PATH):
             raise FileNotFoundError(f"Database not found at {DB_PATH}")
-        self.conn = sqlite3.connect(DB_PATH)
+        if read_only:
+            # Used by the HTTP server's pool: each connection is handed between worker threads
+            uri = Path(DB_PATH).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(DB_PATH)
         self.conn.row_factory = sqlite3.Row
+        # Databases built before unique_id was added can still resolve by name + pitch
+        self.columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(cards)")]
+        self.has_unique_id = "unique_id" in self.columns
 
     def advanced_search(self, filters):
+        return self.search_cursor(filters).fetchall()
+
+    def search_cursor(self, filters, as_json=False):
+        """
+        Runs the search and returns the open cursor so large results can be fetched in batches.
+        With as_json each row is a single JSON object string built by SQLite itself.
+        """
         # We ensure local_path is part of the selection
         query = "SELECT * FROM cards WHERE 1=1"
         params = []
@@ -36,4 +52,37 @@ class SQLiteSearch:
         if filters.get('legal_silver_age'):
             query += " AND legal_silver_age = 1"
 
-        return self.conn.execute(query, params).fetchall()
+        if as_json:
+            fields = ", ".join(f"'{c}', {c}" for c in self.columns)
+            query = f"SELECT json_object({fields}) FROM ({query})"
+        return self.conn.execute(query, params)
+
+    def get_card(self, card_id):
+        """Fetches one card by its card.json unique_id, or by row id for older databases."""
+        if self.has_unique_id and not str(card_id).isdigit():
+            return self.conn.execute("SELECT * FROM cards WHERE unique_id = ?", (card_id,)).fetchone()
+        return self.conn.execute("SELECT * FROM cards WHERE id = ?", (card_id,)).fetchone()
+
+    def lookup_cards(self, refs):
+        """Resolves (unique_id, name, pitch) references to card rows in a single query."""
+        ids, pairs = [], []
+        for unique_id, name, pitch in refs:
+            if unique_id and self.has_unique_id:
+                ids.append(unique_id)
+            else:
+                pairs.append((name, pitch))
+
+        selects, params = [], []
+        if ids:
+            selects.append(f"SELECT * FROM cards WHERE unique_id IN ({', '.join('?' * len(ids))})")
+            params.extend(ids)
+        if pairs:
+            # Join against a VALUES table rather than chaining ORs, which hits SQLite's expression depth limit
+            values = ", ".join("(?, ?)" for _ in pairs)
+            selects.append(f"SELECT cards.* FROM cards JOIN (VALUES {values}) AS refs "
+                           "ON cards.name = refs.column1 AND cards.pitch IS refs.column2")
+            params.extend(value for pair in pairs for value in pair)
+        if not selects:
+            return []
+
+        return self.conn.execute(" UNION ".join(selects), params).fetchall()
@@ -22,6 +22,7 @@ def create_tables(conn):
     conn.execute("""
     CREATE TABLE cards (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
+        unique_id TEXT,  -- Stable id from card.json, used by saved decks
         name TEXT, color TEXT, pitch INTEGER, cost TEXT,
         power TEXT, defense TEXT, card_types TEXT, traits TEXT,
         keywords TEXT, function_text TEXT,
@@ -31,6 +32,8 @@ def create_tables(conn):
     )
     """)
     conn.execute("CREATE INDEX idx_name ON cards(name)")
+    conn.execute("CREATE INDEX idx_name_pitch ON cards(name, pitch)")
+    conn.execute("CREATE INDEX idx_unique_id ON cards(unique_id)")
 
 
 def populate_database():
@@ -53,12 +56,12 @@ def populate_database():
 
         conn.execute("""
         INSERT INTO cards (
-            name, color, pitch, cost, power, defense,
+            unique_id, name, color, pitch, cost, power, defense,
             card_types, traits, keywords, function_text,
             legal_cc, legal_blitz, legal_silver_age, image_url, local_path
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
-            c.name, c.color, c.pitch, c.cost, c.power, c.defense,
+            c.unique_id, c.name, c.color, c.pitch, c.cost, c.power, c.defense,
             ", ".join(c.types), ", ".join(c.traits), ", ".join(c.keywords),
             c.text, int(c.is_legal("CC")), int(c.is_legal("Blitz")),
             int(c.is_legal("Silver Age")), c.image_url, local_filename